@@ -1,45 +1,13 @@
 #!/usr/bin/env python
 import os
+import stat
 import sys
 import argparse
-from pathlib import Path
-import importlib_resources
-import threading
-import traceback
-
-try:
-    import git  # Try importing git
-except ImportError:
-    git = None
-
-# Use absolute imports from the package root
-from aider.models import (
-    Model,
-    register_models,
-    register_litellm_models,
-    print_matching_models,  # Added for potential future use/debugging
-    ModelSettings,  # Added for map_tokens default logic
-)
-from aider.repo import GitRepo, ANY_GIT_ERROR
-from aider.main import (
-    load_dotenv_files,
-    get_git_root,
-    load_slow_imports,
-    generate_search_path_list,
-    register_models as main_register_models,  # Keep distinct name if needed later
-    register_litellm_models as main_register_litellm_models,  # Keep distinct name
-    make_new_repo,  # Added
-    check_gitignore,  # Added
-    setup_git,  # Added
-    guessed_wrong_repo,  # Added
-    sanity_check_repo,  # Added
-)
-from aider.args import default_env_file
-from aider.io import InputOutput  # For compatibility if OperatorIO needs methods
-from aider.utils import check_pip_install_extra  # For potential future checks
-
-# Use relative import within the package
-from ..operator.core import OperatorIO, run_aider_operator
+
+from aider.operator.discovery_cache import files_git_root, get_repo_info
+
+# Heavy aider modules (litellm, GitPython, Coder machinery) are imported inside
+# main() once the arguments have been parsed, so --help and usage errors stay fast.
 
 # --- Constants ---
 AIDER_CONF_FNAME = ".aider.conf.yml"  # Mirroring main.py
@@ -48,22 +16,12 @@ MODEL_METADATA_FNAME = ".aider.model.metadata.json"
 AIDERIGNORE_FNAME = ".aiderignore"
 
 
-def main():
-    # --- Initial Git Root Discovery (for config defaults) ---
-    # Try to find git root early for default file paths, mirroring aider.main behavior
-    try:
-        initial_git_root_guess = get_git_root()
-    except ImportError:
-        initial_git_root_guess = None
-        if git is not None:  # If the module object exists but failed internally
-            print(
-                "Warning: GitPython is installed but failed to find git root.",
-                file=sys.stderr,
-            )
-    except Exception as e:
-        print(f"Warning: Error during initial git root discovery: {e}", file=sys.stderr)
-        initial_git_root_guess = None
+def fast_excepthook(exc_type, exc, tb):
+    # Skips formatting the traceback, which reads source files via linecache/tokenize
+    print(f"{exc_type.__name__}: {exc}", file=sys.stderr)
+
 
+def main():
     parser = argparse.ArgumentParser(
         description="Aider Operator: Automates Aider tasks via CLI."
     )
@@ -89,7 +47,7 @@ def main():
     parser.add_argument(
         "--env-file",
         metavar="ENV_FILE",
-        default=default_env_file(initial_git_root_guess),
+        default=None,
         help=f"Specify the .env file to load (default: .env in git root or cwd, searched like {MODEL_SETTINGS_FNAME}).",
     )
     # Model selection
@@ -257,6 +215,42 @@ def main():
 
     args = parser.parse_args()
 
+    # Uncaught errors get a one-line report, --verbose keeps the full traceback
+    if not args.verbose:
+        sys.excepthook = fast_excepthook
+
+    try:
+        import git
+    except ImportError:
+        git = None
+
+    import importlib_resources
+    import traceback
+    from pathlib import Path
+
+    from aider.args import default_env_file
+    from aider.io import InputOutput
+    from aider.main import (
+        check_gitignore,
+        generate_search_path_list,
+        load_dotenv_files,
+        load_slow_imports,
+        sanity_check_repo,
+    )
+    from aider.operator.core import run_aider_operator
+    from aider.operator.registry_cache import register_model_files
+    from aider.repo import ANY_GIT_ERROR, GitRepo
+
+    # --- Initial Git Root Discovery ---
+    # Cached across runs along with the HEAD commit's file list, see discovery_cache
+    repo_info = dict(git_root=None, tracked_files=None)
+    if args.git and git is not None:
+        try:
+            repo_info = get_repo_info(os.getcwd())
+        except Exception as e:
+            print(f"Warning: Error during initial git root discovery: {e}", file=sys.stderr)
+    initial_git_root_guess = repo_info["git_root"]
+
     # Use stderr for CLI setup messages
     print("--- Starting Aider Operator CLI ---", file=sys.stderr)
 
@@ -315,16 +309,13 @@ def main():
 
             if git_root_found:
                 # Now verify it's the correct one based on args.files if provided
-                # (mimics main.py's check after parsing args)
-                potential_fnames = [str(Path(f).resolve()) for f in args.files]
-                right_repo_root = guessed_wrong_repo(
-                    operator_io, git_root_found, potential_fnames, None
-                )  # No explicit git_dname from args
+                # (mimics main.py's guessed_wrong_repo, without a throwaway GitRepo)
+                right_repo_root = files_git_root(args.files, operator_io)
 
                 if (
                     right_repo_root
-                    and Path(right_repo_root).resolve()
-                    != Path(git_root_found).resolve()
+                    and os.path.realpath(right_repo_root)
+                    != os.path.realpath(git_root_found)
                 ):
                     operator_io.tool_warning(
                         f"Initial git root guess {git_root_found} might be incorrect based on files."
@@ -372,15 +363,18 @@ def main():
         )
         use_git = False
 
-    # Coder root is git root if git is used, otherwise CWD
-    coder_root = git_root if use_git and git_root else str(Path.cwd())
+    # Coder root is git root if git is used, otherwise CWD.
+    # Resolve it once and hand the same canonical string to every consumer below.
+    coder_root = sys.intern(os.path.realpath(git_root if use_git and git_root else os.getcwd()))
+    if use_git and git_root:
+        git_root = coder_root
     operator_io.tool_output(f"Using coder root: {coder_root}")
 
     # --- Load .env Files ---
     # Use the *final* determined git_root for search path
-    # Re-evaluate env_file default based on final git_root
-    if args.env_file == default_env_file(initial_git_root_guess):
-        args.env_file = default_env_file(git_root)  # Use final git_root
+    # Default env_file is based on the final git_root
+    if args.env_file is None:
+        args.env_file = default_env_file(git_root)
 
     loaded_dotenvs = load_dotenv_files(git_root, args.env_file, operator_io.encoding)
     if args.verbose:
@@ -400,17 +394,6 @@ def main():
             git_root,
             None,  # No explicit CLI arg for settings file in operator
         )
-        # Use the imported register_models directly
-        files_loaded_settings = register_models(model_settings_files)
-        if args.verbose:
-            if files_loaded_settings:
-                operator_io.tool_output("Loaded model settings from:")
-                for file_loaded in files_loaded_settings:
-                    operator_io.tool_output(f"  - {file_loaded}")
-            # else: operator_io.tool_output("No custom model settings files found or loaded.")
-            # operator_io.tool_output("Searched for model settings files:")
-            # for file in model_settings_files: operator_io.tool_output(f"  - {file}")
-
         # Register model metadata (JSON) - including resource file
         model_metadata_files = []
         try:
@@ -432,9 +415,19 @@ def main():
             git_root,
             None,  # No explicit CLI arg for metadata file in operator
         )
-        # Use the imported register_litellm_models directly
-        files_loaded_metadata = register_litellm_models(model_metadata_files)
+        # Registers both, replaying the results from cache when no file changed
+        files_loaded_settings, files_loaded_metadata = register_model_files(
+            model_settings_files, model_metadata_files
+        )
         if args.verbose:
+            if files_loaded_settings:
+                operator_io.tool_output("Loaded model settings from:")
+                for file_loaded in files_loaded_settings:
+                    operator_io.tool_output(f"  - {file_loaded}")
+            # else: operator_io.tool_output("No custom model settings files found or loaded.")
+            # operator_io.tool_output("Searched for model settings files:")
+            # for file in model_settings_files: operator_io.tool_output(f"  - {file}")
+
             if files_loaded_metadata:
                 operator_io.tool_output("Loaded model metadata from:")
                 for file_loaded in files_loaded_metadata:
@@ -488,81 +481,41 @@ def main():
             )
         operator_io.tool_output(f"Using default LCR model: {args.lcr_model}")
 
-    try:
-        # Initialize architect model first, its properties might influence others
-        architect_model_obj = Model(
-            args.architect_model,
-            weak_model=args.weak_model,
-            editor_model=args.editor_model,  # Pass editor name for potential internal use
-        )
-        operator_io.tool_output(
-            f"Architect model ({architect_model_obj.name}) initialized."
-        )
-
-        # Determine default weak model if needed, based on architect model
-        # This mirrors logic within Model.__init__ implicitly
-        effective_weak_model_name = architect_model_obj.weak_model_name
-        if effective_weak_model_name and args.verbose:
-            operator_io.tool_output(
-                f"Effective weak model for commits/summaries: {effective_weak_model_name}"
-            )
-
-        # Initialize editor model (often the same object if names match, handled by Model cache)
-        editor_model_obj = Model(args.editor_model)  # Use resolved editor name
-        operator_io.tool_output(f"Editor model ({editor_model_obj.name}) initialized.")
-
-        # Initialize LCR model
-        lcr_model_obj = Model(args.lcr_model)
-        operator_io.tool_output(f"LCR model ({lcr_model_obj.name}) initialized.")
-
-    except Exception as e:
-        operator_io.tool_error(f"Error initializing models: {e}")
-        if args.verbose:
-            traceback.print_exc(file=sys.stderr)
-        # Check if specific keys are missing
-        if "api key" in str(e).lower():
-            operator_io.tool_error(
-                "Please ensure the required API key is set via --api-key, .env file, or environment variable."
-            )
-        return 1
-
-    # --- Determine map_tokens Default ---
-    # Based on the *architect* model, mirroring main.py's logic
-    map_tokens = args.map_tokens
-    if map_tokens is None:
-        map_tokens = architect_model_obj.get_repo_map_tokens()
-        if args.verbose:
-            operator_io.tool_output(
-                f"Using default repo map tokens based on architect model: {map_tokens}"
-            )
-
     # --- Resolve Initial File Paths ---
     initial_abs_files = []
     read_only_abs_files = []
 
     # Process positional files (editable)
+    # One stat per file; os.path.join keeps fname_rel as-is when it's absolute
+    root_str = os.fspath(coder_root)
     for fname_rel in args.files:
-        path_obj = Path(fname_rel)
-        abs_path = path_obj if path_obj.is_absolute() else Path(coder_root) / fname_rel
+        abs_path = os.path.join(root_str, fname_rel)
         try:
-            resolved_path = abs_path.resolve()
-            if resolved_path.is_file():
-                initial_abs_files.append(str(resolved_path))
-            elif resolved_path.is_dir():
-                operator_io.tool_warning(
-                    f"Specified path is a directory, not adding to initial files: {resolved_path}"
-                )
-                operator_io.tool_output(
-                    "Specify individual files or rely on LCR for directories."
-                )
-            else:
-                operator_io.tool_warning(
-                    f"Specified path not found or not a file: {resolved_path}, skipping."
-                )
+            st = os.stat(abs_path)
+        except FileNotFoundError:
+            operator_io.tool_warning(
+                f"Specified path not found or not a file: {abs_path}, skipping."
+            )
+            continue
         except OSError as e:
             operator_io.tool_warning(
                 f"Error resolving or checking file {abs_path}: {e}, skipping."
             )
+            continue
+
+        if stat.S_ISREG(st.st_mode):
+            initial_abs_files.append(os.path.realpath(abs_path))
+        elif stat.S_ISDIR(st.st_mode):
+            operator_io.tool_warning(
+                f"Specified path is a directory, not adding to initial files: {abs_path}"
+            )
+            operator_io.tool_output(
+                "Specify individual files or rely on LCR for directories."
+            )
+        else:
+            operator_io.tool_warning(
+                f"Specified path not found or not a file: {abs_path}, skipping."
+            )
 
     # Process --read files (read-only) - mirroring main.py logic
     for fn in args.read:
@@ -609,29 +562,20 @@ def main():
             "No initial files specified or found, LCR will determine context."
         )
 
-    if args.git:
-        git_root = setup_git(git_root, operator_io)
-        if args.gitignore:
-            check_gitignore(git_root, operator_io)
-
     # --- Initialize GitRepo ---
     if use_git and git_root:
         try:
             # Combine editable and read-only for GitRepo context finding, but it mainly uses git status/ls-files
             all_initial_context_files = initial_abs_files + read_only_abs_files
 
-            # Pass models needed for commit messages *if* auto_commits is on
-            commit_models = []
-            if args.auto_commits:
-                # Use the effective weak model and the architect model
-                commit_models = [architect_model_obj.weak_model, architect_model_obj]
-
+            # Models for commit messages are set by run_aider_operator() once the
+            # architect model is initialized, commits only happen in Phase 2
             repo = GitRepo(
                 io=operator_io,
                 fnames=all_initial_context_files,
                 git_dname=git_root,
                 aider_ignore_file=args.aiderignore,
-                models=commit_models,
+                models=[],
                 attribute_author=args.attribute_author,
                 attribute_committer=args.attribute_committer,
                 attribute_commit_message_author=args.attribute_commit_message_author,
@@ -639,6 +583,11 @@ def main():
                 commit_prompt=args.commit_prompt,
                 subtree_only=args.subtree_only,
                 git_commit_verify=args.git_commit_verify,
+                tracked_files=(
+                    repo_info["tracked_files"]
+                    if repo_info["git_root"] == git_root
+                    else None
+                ),
             )
             operator_io.tool_output(f"Git repository initialized for {git_root}")
 
@@ -683,8 +632,11 @@ def main():
             user_prompt=args.request,
             initial_files=initial_abs_files,
             read_only_files=read_only_abs_files,
-            lcr_model=lcr_model_obj,
-            architect_model=architect_model_obj,
+            # Models are initialized by run_aider_operator() right before each phase needs them
+            lcr_model_name=args.lcr_model,
+            architect_model_name=args.architect_model,
+            editor_model_name=args.editor_model,
+            weak_model_name=args.weak_model,
             operator_io=operator_io,
             repo=repo,
             coder_root=coder_root,
@@ -692,7 +644,7 @@ def main():
             auto_commits=args.auto_commits,
             dirty_commits=args.dirty_commits,
             verbose=args.verbose,
-            map_tokens=map_tokens,
+            map_tokens=args.map_tokens,
             map_refresh=args.map_refresh,
             map_mul_no_files=args.map_multiplier_no_files,
         )
@@ -709,9 +661,16 @@ def main():
 
 
 def setup_git(git_root, io):
-    if git is None:
+    try:
+        import git
+    except ImportError:
         return
 
+    from pathlib import Path
+
+    from aider.main import make_new_repo
+    from aider.repo import ANY_GIT_ERROR
+
     try:
         cwd = Path.cwd()
     except OSError:
@@ -6,6 +6,7 @@ import math
 import os
 import platform
 import sys
+import threading
 import time
 from dataclasses import dataclass, fields
 from pathlib import Path
@@ -148,10 +149,16 @@ class ModelInfoManager:
         self.local_model_metadata = {}
         self.verify_ssl = True
         self._cache_loaded = False
+        self._update_attempted = False
+        self._refresh_thread = None
 
     def set_verify_ssl(self, verify_ssl):
         self.verify_ssl = verify_ssl
 
+    def remote_disabled(self):
+        # Cache-only mode, never fetch model metadata over the network
+        return bool(os.environ.get("AIDER_DISABLE_REMOTE_MODELS"))
+
     def _load_cache(self):
         if self._cache_loaded:
             return
@@ -160,17 +167,33 @@ class ModelInfoManager:
             self.cache_dir.mkdir(parents=True, exist_ok=True)
             if self.cache_file.exists():
                 cache_age = time.time() - self.cache_file.stat().st_mtime
-                if cache_age < self.CACHE_TTL:
-                    try:
-                        self.content = json.loads(self.cache_file.read_text())
-                    except json.JSONDecodeError:
-                        # If the cache file is corrupted, treat it as missing
+                try:
+                    self.content = json.loads(self.cache_file.read_text())
+                except json.JSONDecodeError:
+                    # If the cache file is corrupted, treat it as missing
+                    self.content = None
+
+                if cache_age >= self.CACHE_TTL:
+                    if self.content and not self.remote_disabled():
+                        # Stale-while-revalidate: use the old copy, refresh it in the background
+                        self._refresh_thread = threading.Thread(
+                            target=self._update_cache, daemon=True
+                        )
+                        self._refresh_thread.start()
+                        self._update_attempted = True
+                    elif not self.remote_disabled():
                         self.content = None
         except OSError:
             pass
 
         self._cache_loaded = True
 
+    def _write_cache(self, text):
+        # Write then rename, so a reader (or an interrupted refresh) never sees a partial file
+        tmp_file = self.cache_file.with_suffix(".tmp")
+        tmp_file.write_text(text)
+        os.replace(tmp_file, self.cache_file)
+
     def _update_cache(self):
         try:
             import requests
@@ -182,11 +205,14 @@ class ModelInfoManager:
             if response.status_code == 200:
                 self.content = response.json()
                 try:
-                    self.cache_file.write_text(json.dumps(self.content, indent=4))
+                    self._write_cache(json.dumps(self.content, indent=4))
                 except OSError:
                     pass
         except Exception as ex:
             print(str(ex))
+            if self.content:
+                # Keep serving the stale copy
+                return
             try:
                 # Save empty dict to cache file on failure
                 self.cache_file.write_text("{}")
@@ -201,7 +227,9 @@ class ModelInfoManager:
         # Ensure cache is loaded before checking content
         self._load_cache()
 
-        if not self.content:
+        # Only try the network once per process, and never in cache-only mode
+        if not self.content and not self._update_attempted and not self.remote_disabled():
+            self._update_attempted = True
             self._update_cache()
 
         if not self.content:
@@ -678,13 +706,7 @@ class Model(ModelSettings):
         return res
 
     def get_repo_map_tokens(self):
-        map_tokens = 1024
-        max_inp_tokens = self.info.get("max_input_tokens")
-        if max_inp_tokens:
-            map_tokens = max_inp_tokens / 8
-            map_tokens = min(map_tokens, 4096)
-            map_tokens = max(map_tokens, 1024)
-        return map_tokens
+        return repo_map_tokens_for_info(self.info)
 
     def set_reasoning_effort(self, effort):
         """Set the reasoning effort parameter for models that support it"""
@@ -950,6 +972,22 @@ def register_litellm_models(model_fnames):
     return files_loaded
 
 
+def repo_map_tokens_for_info(info):
+    map_tokens = 1024
+    max_inp_tokens = info.get("max_input_tokens")
+    if max_inp_tokens:
+        map_tokens = max_inp_tokens / 8
+        map_tokens = min(map_tokens, 4096)
+        map_tokens = max(map_tokens, 1024)
+    return map_tokens
+
+
+def get_default_repo_map_tokens(model_name):
+    """What Model(model_name).get_repo_map_tokens() returns, without creating the Model"""
+    model_name = MODEL_ALIASES.get(model_name, model_name)
+    return repo_map_tokens_for_info(model_info_manager.get_model_info(model_name))
+
+
 def validate_variables(vars):
     missing = []
     for var in vars:
@@ -2,52 +2,91 @@
 import os
 import sys
 import traceback
-from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 
 # --- Aider Imports ---
 # Use absolute imports from the package root
 from aider.coders import Coder
-from aider.models import Model
+from aider.models import Model, get_default_repo_map_tokens
 from aider.io import InputOutput
 from aider.repo import GitRepo, ANY_GIT_ERROR
 
 # --- Operator Specific IO Handler ---
 
 
+class _DummyStream:
+    """Stand-in for the markdown stream, hands the final response to the OperatorIO."""
+
+    __slots__ = ("io", "content")
+
+    def __init__(self, io_instance):
+        self.io = io_instance
+        self.content = ""
+
+    def update(self, content, final=False):
+        # Coder passes the whole response so far on every update, not just the new chunk
+        previous = self.content
+        self.content = content
+
+        if self.io.verbose and content:
+            # Print only the new text to stderr for streaming effect
+            if content.startswith(previous):
+                sys.stderr.write(content[len(previous) :])
+            else:
+                sys.stderr.write("\n" + content)
+            sys.stderr.flush()
+
+        # OperatorIO only keeps the final response, skip the no-op intermediate calls
+        if final:
+            self.io.assistant_output(content, final=True)
+            if self.io.verbose:
+                sys.stderr.write("\n")  # Newline at the end of stream
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        # Ensure final state is captured even if not explicitly finalized
+        # self.io.assistant_output(self.content, final=True)
+        pass  # `update(final=True)` should handle this
+
+
 class OperatorIO(InputOutput):
     """
     A non-interactive IO handler for the Aider operator.
     Captures output and automatically confirms actions.
     """
 
+    # Core settings for non-interactive operation
+    # Operator output isn't meant for rich terminal display, so pretty=False
+    pretty = False
+    yes_always = True  # Assume 'yes' to confirmations
+
+    # Properties for compatibility with InputOutput interface expected by Coder.
+    # These are fixed defaults, so they live on the class rather than each instance.
+    input_history_file = None
+    chat_history_file = None
+    _input = None
+    _output = None
+    user_input_color = None
+    tool_output_color = None
+    tool_warning_color = None
+    tool_error_color = None
+    assistant_output_color = None
+    code_theme = "default"
+    dry_run = False  # Can be set externally if needed
+    line_endings = "platform"
+    llm_history_file = None
+    multiline_mode = False
+    notifications = False
+    notifications_command = None
+    last_prompt = None
+    placeholder = None
+
     def __init__(self, encoding="utf-8", verbose=False, **kwargs):
-        # Core settings for non-interactive operation
-        # Operator output isn't meant for rich terminal display, so pretty=False
-        self.pretty = False
-        self.yes_always = True  # Assume 'yes' to confirmations
         self.verbose = verbose
         self.encoding = encoding
 
-        # Properties for compatibility with InputOutput interface expected by Coder
-        self.input_history_file = None
-        self.chat_history_file = None
-        self._input = None
-        self._output = None
-        self.user_input_color = None
-        self.tool_output_color = None
-        self.tool_warning_color = None
-        self.tool_error_color = None
-        self.assistant_output_color = None
-        self.code_theme = "default"
-        self.dry_run = False  # Can be set externally if needed
-        self.line_endings = "platform"
-        self.llm_history_file = None
-        self.multiline_mode = False
-        self.notifications = False
-        self.notifications_command = None
-        self.last_prompt = None
-        self.placeholder = None
-
         # Simplified captures - just track last assistant output
         self.last_assistant_output = None
 
@@ -62,21 +101,19 @@ class OperatorIO(InputOutput):
         return True
 
     def tool_output(self, *args, **kwargs):
-        message = " ".join(map(str, args))
-        log_only = kwargs.get("log_only", False)
         # Print tool output to stderr if verbose and not log_only
-        if not log_only and self.verbose:
-            print(f"OPERATOR_IO_TOOL: {message}", file=sys.stderr)
+        # Bail out before formatting anything, this is the common case
+        if kwargs.get("log_only") or not self.verbose:
+            return
+        print("OPERATOR_IO_TOOL:", *args, file=sys.stderr)
 
     def tool_warning(self, *args, **kwargs):
-        message = " ".join(map(str, args))
         # Always print warnings to stderr
-        print(f"OPERATOR_IO_WARN: {message}", file=sys.stderr)
+        print("OPERATOR_IO_WARN:", *args, file=sys.stderr)
 
     def tool_error(self, *args, **kwargs):
-        message = " ".join(map(str, args))
         # Always print errors to stderr
-        print(f"OPERATOR_IO_ERR: {message}", file=sys.stderr)
+        print("OPERATOR_IO_ERR:", *args, file=sys.stderr)
 
     def assistant_output(self, content, final=True, **kwargs):
         # Store the final assistant output
@@ -112,37 +149,13 @@ class OperatorIO(InputOutput):
 
     def user_input(self, text):
         # Log the effective user input (prompt) if verbose
-        if self.verbose:
-            print(f"OPERATOR_IO_USER_INPUT: {text}", file=sys.stderr)
+        if not self.verbose:
+            return
+        print("OPERATOR_IO_USER_INPUT:", text, file=sys.stderr)
 
     def get_assistant_mdstream(self):
         # Simplified dummy stream for non-interactive processing
-        class DummyStream:
-            def __init__(self, io_instance):
-                self.io = io_instance
-                self.content_buffer = ""
-
-            def update(self, content, final=False):
-                # Accumulate content
-                self.content_buffer += content
-                # Pass intermediate/final content to the main assistant_output method
-                self.io.assistant_output(self.content_buffer, final=final)
-                # Print intermediate stream output to stderr if verbose
-                if self.io.verbose and content:
-                    # Print only the new chunk to stderr for streaming effect
-                    print(content, end="", flush=True, file=sys.stderr)
-                if self.io.verbose and final:
-                    print(file=sys.stderr)  # Newline at the end of stream
-
-            def __enter__(self):
-                return self
-
-            def __exit__(self, *args):
-                # Ensure final state is captured even if not explicitly finalized
-                # self.io.assistant_output(self.content_buffer, final=True)
-                pass  # `update(final=True)` should handle this
-
-        return DummyStream(self)
+        return _DummyStream(self)
 
     # Methods made into simple no-ops or basic logging
     def set_last_prompt(self, prompt):
@@ -167,12 +180,25 @@ class OperatorIO(InputOutput):
 # --- Operator Execution Logic ---
 
 
+def report_model_error(operator_io, e, verbose):
+    operator_io.tool_error(f"Error initializing models: {e}")
+    if verbose:
+        traceback.print_exc(file=sys.stderr)
+    # Check if specific keys are missing
+    if "api key" in str(e).lower():
+        operator_io.tool_error(
+            "Please ensure the required API key is set via --api-key, .env file, or environment variable."
+        )
+
+
 def run_aider_operator(
     user_prompt: str,
     initial_files: list,  # Absolute paths for editable files
     read_only_files: list,  # Absolute paths for read-only files
-    lcr_model: Model,
-    architect_model: Model,
+    lcr_model_name: str,
+    architect_model_name: str,
+    editor_model_name: str,
+    weak_model_name: str | None,
     operator_io: OperatorIO,
     repo: GitRepo | None,
     coder_root: str,  # Determined root for relative path resolution if needed
@@ -180,63 +206,132 @@ def run_aider_operator(
     auto_commits: bool,
     dirty_commits: bool,  # Added
     verbose: bool,
-    map_tokens: int,
+    map_tokens: int | None,  # None picks the architect model's default
     map_refresh: str,
     map_mul_no_files: float,
 ) -> int:
     """
-    Runs the core Aider operator process using pre-configured components.
+    Runs the core Aider operator process. Models are initialized from their names
+    only when (and if) the phase that uses them runs.
     Returns 0 on success, 1 on failure.
     """
     try:
-        # --- Phase 1: Large Context Retriever ---
-        operator_io.tool_output("\n--- Phase 1: Large Context Retriever ---")
-        lcr_coder = Coder.create(
-            main_model=lcr_model,
-            edit_format="large_context_retriever",
-            io=operator_io,
-            repo=repo,
-            fnames=initial_files,
-            read_only_fnames=read_only_files,  # Pass read-only files
-            verbose=verbose,
-            use_git=use_git,  # Use passed parameter
-            stream=False,  # LCR usually doesn't stream well
-            map_tokens=map_tokens,  # Use passed parameter
-            map_refresh=map_refresh,  # Use passed parameter
-            map_mul_no_files=map_mul_no_files,  # Use passed parameter
-            # Other relevant defaults from Coder.create will apply
-        )
-
-        # Run LCR - use coder.run()
-        lcr_coder.run(with_message=user_prompt)
+        if map_tokens is None:
+            # Based on the *architect* model, mirroring main.py's logic. Only its metadata
+            # is needed, so the architect Model can still initialize during Phase 1.
+            map_tokens = get_default_repo_map_tokens(architect_model_name)
+            if verbose:
+                operator_io.tool_output(
+                    f"Using default repo map tokens based on architect model: {map_tokens}"
+                )
 
-        # Get files identified by LCR to potentially pass or log
-        # Note: LCR edit format adds files directly to the chat context
-        identified_files_rel = lcr_coder.get_inchat_relative_files()
-        if not identified_files_rel:
-            operator_io.tool_warning(
-                "LCR phase did not explicitly add files to chat. Proceeding with initial/repo context."
+        # --- Phase 1: Large Context Retriever ---
+        lcr_coder = None
+        architect_model_future = None
+        if initial_files:
+            # Files were given explicitly, LCR would have nothing to add
+            operator_io.tool_output(
+                "\n--- Phase 1: Skipping Large Context Retriever (files specified) ---"
             )
         else:
-            operator_io.tool_output(
-                f"LCR added files to context: {identified_files_rel}"
+            operator_io.tool_output("\n--- Phase 1: Large Context Retriever ---")
+            try:
+                lcr_model = Model(lcr_model_name)
+            except Exception as e:
+                report_model_error(operator_io, e, verbose)
+                return 1
+            operator_io.tool_output(f"LCR model ({lcr_model.name}) initialized.")
+
+            # The architect model (which also builds its editor and weak models) isn't
+            # needed until Phase 2, so initialize it in the background while LCR runs.
+            model_executor = ThreadPoolExecutor(max_workers=1)
+            architect_model_future = model_executor.submit(
+                Model,
+                architect_model_name,
+                weak_model=weak_model_name,
+                editor_model=editor_model_name,
+            )
+            model_executor.shutdown(wait=False)
+
+            lcr_coder = Coder.create(
+                main_model=lcr_model,
+                edit_format="large_context_retriever",
+                io=operator_io,
+                repo=repo,
+                fnames=initial_files,
+                read_only_fnames=read_only_files,  # Pass read-only files
+                verbose=verbose,
+                use_git=use_git,  # Use passed parameter
+                stream=False,  # LCR usually doesn't stream well
+                map_tokens=map_tokens,  # Use passed parameter
+                map_refresh=map_refresh,  # Use passed parameter
+                map_mul_no_files=map_mul_no_files,  # Use passed parameter
+                # Other relevant defaults from Coder.create will apply
             )
 
-        # Optional: Output the repo map after LCR run (might be updated)
-        if verbose and repo:
-            repo_map_content = lcr_coder.get_repo_map()
-            if repo_map_content:
-                operator_io.tool_output(f"Repo map after LCR:\n{repo_map_content}")
+            # Run LCR - use coder.run()
+            lcr_coder.run(with_message=user_prompt)
+
+            # Get files identified by LCR to potentially pass or log
+            # Note: LCR edit format adds files directly to the chat context
+            identified_files_rel = lcr_coder.get_inchat_relative_files()
+            if not identified_files_rel:
+                operator_io.tool_warning(
+                    "LCR phase did not explicitly add files to chat. Proceeding with initial/repo context."
+                )
             else:
-                operator_io.tool_output("Repo map is disabled or empty after LCR.")
+                operator_io.tool_output(
+                    f"LCR added files to context: {identified_files_rel}"
+                )
+
+            # Optional: Output the repo map after LCR run (might be updated)
+            if verbose and repo:
+                repo_map_content = lcr_coder.get_repo_map()
+                if repo_map_content:
+                    operator_io.tool_output(f"Repo map after LCR:\n{repo_map_content}")
+                else:
+                    operator_io.tool_output("Repo map is disabled or empty after LCR.")
 
         # --- Phase 2: Architect / Editor ---
         operator_io.tool_output("\n--- Phase 2: Architect/Editor ---")
 
+        try:
+            if architect_model_future:
+                # Initialized in the background while Phase 1 ran
+                architect_model = architect_model_future.result()
+            else:
+                architect_model = Model(
+                    architect_model_name,
+                    weak_model=weak_model_name,
+                    editor_model=editor_model_name,
+                )
+        except Exception as e:
+            report_model_error(operator_io, e, verbose)
+            return 1
+
+        operator_io.tool_output(f"Architect model ({architect_model.name}) initialized.")
+        if verbose:
+            if architect_model.editor_model:
+                operator_io.tool_output(f"Editor model: {architect_model.editor_model.name}")
+            if architect_model.weak_model_name:
+                operator_io.tool_output(
+                    f"Effective weak model for commits/summaries: {architect_model.weak_model_name}"
+                )
+
+        if repo and auto_commits:
+            # Use the effective weak model and the architect model for commit messages
+            repo.models = [architect_model.weak_model, architect_model]
+
+        if lcr_coder:
+            # Inherit state (files, repo, io, encoding etc.)
+            context_kwargs = dict(from_coder=lcr_coder)
+        else:
+            context_kwargs = dict(fnames=initial_files, read_only_fnames=read_only_files)
+
         architect_coder = Coder.create(
             main_model=architect_model,
             edit_format="architect",
-            from_coder=lcr_coder,  # Inherit state (files, repo, io, encoding etc.)
+            **context_kwargs,
             # Explicitly override specific settings needed for this phase:
             io=operator_io,  # Ensure it uses the operator IO
             repo=repo,  # Pass repo again (though from_coder should handle)
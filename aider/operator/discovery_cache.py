@@ -0,0 +1,177 @@
+# aider/operator/discovery_cache.py
+"""
+Git root discovery, plus an on-disk cache of the HEAD commit's file listing.
+
+The git root is always discovered afresh (it's only a few stats). The listing
+is kept in one cache file per git root, holding just the current HEAD, and is
+reused as long as HEAD (its mtime and the commit it points to) is unchanged.
+"""
+import json
+import os
+
+CACHE_DNAME = "repo_discovery"
+
+
+def cache_file(git_root):
+    import hashlib
+
+    # Plain os.path, this module is imported on the CLI's startup path
+    fname = hashlib.sha1(git_root.encode("utf-8")).hexdigest() + ".json"
+    return os.path.join(os.path.expanduser("~"), ".aider", "caches", CACHE_DNAME, fname)
+
+
+def discover_git_root(path):
+    """Find the working tree root containing path without opening the repo."""
+    path = os.path.abspath(path)
+    if not os.path.isdir(path):
+        path = os.path.dirname(path)
+
+    while True:
+        if os.path.exists(os.path.join(path, ".git")):
+            return path
+        parent = os.path.dirname(path)
+        if parent == path:
+            return None
+        path = parent
+
+
+def files_git_root(fnames, io):
+    """
+    Return the one git root shared by fnames, like GitRepo does for its fnames.
+
+    Returns None if none of them are in a repo, or (with a warning) if they
+    span more than one.
+    """
+    file_roots = {discover_git_root(os.path.realpath(fname)) for fname in fnames}
+    file_roots.discard(None)
+    if len(file_roots) > 1:
+        io.tool_warning("Files are in different git repos.")
+        return None
+    if file_roots:
+        return file_roots.pop()
+    return None
+
+
+def get_git_dir(git_root):
+    dot_git = os.path.join(git_root, ".git")
+    if not os.path.isfile(dot_git):
+        return dot_git
+
+    # Worktrees and submodules use a .git file pointing at the real git dir
+    try:
+        with open(dot_git) as f:
+            content = f.read().strip()
+    except OSError:
+        return None
+    if not content.startswith("gitdir:"):
+        return None
+    return os.path.normpath(os.path.join(git_root, content[len("gitdir:") :].strip()))
+
+
+def read_head(git_dir):
+    """Return (mtime, sha) for HEAD, read directly from the git dir."""
+    head_path = os.path.join(git_dir, "HEAD")
+    try:
+        mtime = os.stat(head_path).st_mtime
+        with open(head_path) as f:
+            head = f.read().strip()
+    except OSError:
+        return None, None
+
+    if not head.startswith("ref:"):
+        return mtime, head  # detached HEAD
+
+    ref = head[len("ref:") :].strip()
+    try:
+        with open(os.path.join(git_dir, ref)) as f:
+            return mtime, f.read().strip()
+    except OSError:
+        pass
+
+    try:
+        with open(os.path.join(git_dir, "packed-refs")) as f:
+            for line in f:
+                parts = line.split()
+                if len(parts) == 2 and parts[1] == ref:
+                    return mtime, parts[0]
+    except OSError:
+        pass
+
+    # Unborn branch, or refs we can't read without git (eg: linked worktrees)
+    return mtime, None
+
+
+def list_head_files(git_root):
+    """List the paths in the HEAD commit's tree, or None if git can't read it."""
+    try:
+        import git
+
+        from aider.repo import ANY_GIT_ERROR
+    except ImportError:
+        return None
+
+    try:
+        commit = git.Repo(git_root, odbt=git.GitDB).head.commit
+        return [blob.path for blob in commit.tree.traverse() if blob.type == "blob"]
+    except ANY_GIT_ERROR:
+        return None
+
+
+def load_cache(git_root):
+    try:
+        with open(cache_file(git_root)) as f:
+            entry = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(entry, dict) or entry.get("git_root") != git_root:
+        return None
+    return entry
+
+
+def save_cache(git_root, entry):
+    try:
+        path = cache_file(git_root)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(entry, f)
+    except OSError:
+        pass
+
+
+def get_repo_info(target_dir):
+    """
+    Return dict(git_root=..., tracked_files=...) for target_dir.
+
+    tracked_files lists the HEAD commit's files relative to git_root, and is
+    None when it could not be determined.
+    """
+    git_root = discover_git_root(os.path.realpath(target_dir))
+    if not git_root:
+        return dict(git_root=None, tracked_files=None)
+
+    git_dir = get_git_dir(git_root)
+    head_mtime, head_sha = read_head(git_dir) if git_dir else (None, None)
+    if not head_sha:
+        # Nothing stable to key the listing on, let GitRepo enumerate as usual
+        return dict(git_root=git_root, tracked_files=None)
+
+    entry = load_cache(git_root)
+    if entry and entry.get("head_mtime") == head_mtime and entry.get("head_sha") == head_sha:
+        return dict(git_root=git_root, tracked_files=entry["tracked_files"])
+
+    tracked_files = list_head_files(git_root)
+    if tracked_files is None:
+        return dict(git_root=git_root, tracked_files=None)
+
+    # Overwrites the listing for any previous HEAD of this repo
+    save_cache(
+        git_root,
+        dict(
+            git_root=git_root,
+            head_mtime=head_mtime,
+            head_sha=head_sha,
+            tracked_files=tracked_files,
+        ),
+    )
+
+    return dict(git_root=git_root, tracked_files=tracked_files)
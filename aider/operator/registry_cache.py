@@ -0,0 +1,112 @@
+# aider/operator/registry_cache.py
+"""
+On-disk cache of what the model settings/metadata files register.
+
+Parsing the bundled model-metadata.json with json5 (plus any user YAML/JSON
+files) happens on every run. The registrations are replayed from a plain JSON
+cache instead, as long as none of the searched files changed.
+"""
+import json
+import os
+from dataclasses import asdict
+from pathlib import Path
+
+from aider import models
+
+CACHE_FNAME = "model_registry.json"
+
+
+def cache_file():
+    return Path.home() / ".aider" / "caches" / CACHE_FNAME
+
+
+def files_key(fnames):
+    """Identify a set of search paths by the mtime and size of each one that exists."""
+    key = []
+    for fname in fnames:
+        fname = str(fname)
+        try:
+            st = os.stat(fname)
+            key.append([fname, st.st_mtime_ns, st.st_size])
+        except OSError:
+            key.append([fname, None, None])
+    return key
+
+
+def load_entry(key):
+    try:
+        entry = json.loads(cache_file().read_text())
+    except (OSError, ValueError):
+        return None
+    if not isinstance(entry, dict) or entry.get("key") != key:
+        return None
+    return entry
+
+
+def save_entry(entry):
+    try:
+        path = cache_file()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(entry))
+    except (OSError, TypeError, ValueError):
+        pass
+
+
+def apply_model_settings(settings_dicts):
+    # Same replace-by-name logic as models.register_models()
+    for settings_dict in settings_dicts:
+        model_settings = models.ModelSettings(**settings_dict)
+        existing_model_settings = next(
+            (ms for ms in models.MODEL_SETTINGS if ms.name == model_settings.name),
+            None,
+        )
+        if existing_model_settings:
+            models.MODEL_SETTINGS.remove(existing_model_settings)
+        models.MODEL_SETTINGS.append(model_settings)
+
+
+def register_model_files(model_settings_files, model_metadata_files):
+    """
+    Cached equivalent of models.register_models() followed by
+    models.register_litellm_models().
+
+    Returns (settings_files_loaded, metadata_files_loaded).
+    """
+    key = [files_key(model_settings_files), files_key(model_metadata_files)]
+
+    entry = load_entry(key)
+    if entry:
+        apply_model_settings(entry["model_settings"])
+        models.model_info_manager.local_model_metadata.update(entry["model_metadata"])
+        return entry["settings_loaded"], entry["metadata_loaded"]
+
+    # Record what the real registration adds, so it can be replayed next time.
+    # Hold on to the old objects: register_models() drops the ones it overrides, and
+    # without a reference their ids could be reused by the new settings.
+    settings_before = list(models.MODEL_SETTINGS)
+    settings_before_ids = set(id(ms) for ms in settings_before)
+    metadata_before = dict(models.model_info_manager.local_model_metadata)
+
+    settings_loaded = models.register_models(model_settings_files)
+    metadata_loaded = models.register_litellm_models(model_metadata_files)
+
+    new_settings = [
+        asdict(ms) for ms in models.MODEL_SETTINGS if id(ms) not in settings_before_ids
+    ]
+    new_metadata = {
+        name: info
+        for name, info in models.model_info_manager.local_model_metadata.items()
+        if metadata_before.get(name) != info
+    }
+
+    save_entry(
+        dict(
+            key=key,
+            settings_loaded=[str(fname) for fname in settings_loaded],
+            metadata_loaded=[str(fname) for fname in metadata_loaded],
+            model_settings=new_settings,
+            model_metadata=new_metadata,
+        )
+    )
+
+    return settings_loaded, metadata_loaded
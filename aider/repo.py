@@ -58,6 +58,7 @@ class GitRepo:
         commit_prompt=None,
         subtree_only=False,
         git_commit_verify=True,
+        tracked_files=None,
     ):
         self.io = io
         self.models = models
@@ -111,6 +112,14 @@ class GitRepo:
         if aider_ignore_file:
             self.aider_ignore_file = Path(aider_ignore_file)
 
+        if tracked_files is not None:
+            # Caller already knows the HEAD commit's files, skip the tree traversal
+            try:
+                commit = self.repo.head.commit
+                self.tree_files[commit] = set(self.normalize_path(path) for path in tracked_files)
+            except ANY_GIT_ERROR:
+                pass
+
     def commit(self, fnames=None, context=None, message=None, aider_edits=False):
         if not fnames and not self.repo.is_dirty():
             return
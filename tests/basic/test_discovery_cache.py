@@ -0,0 +1,104 @@
+import os
+from pathlib import Path
+from unittest import TestCase
+from unittest.mock import MagicMock, patch
+
+import git
+
+from aider.operator.discovery_cache import discover_git_root, files_git_root, get_repo_info
+from aider.utils import GitTemporaryDirectory, IgnorantTemporaryDirectory, make_repo
+
+
+class TestDiscoveryCache(TestCase):
+    def test_discover_git_root_from_subdir_and_file(self):
+        with GitTemporaryDirectory() as temp_dir:
+            root = str(Path(temp_dir).resolve())
+            subdir = Path(root) / "a" / "b"
+            subdir.mkdir(parents=True)
+            fname = subdir / "file.py"
+            fname.touch()
+
+            self.assertEqual(discover_git_root(root), root)
+            self.assertEqual(discover_git_root(subdir), root)
+            self.assertEqual(discover_git_root(fname), root)
+            # Files that don't exist yet are resolved via their directory
+            self.assertEqual(discover_git_root(subdir / "new.py"), root)
+
+    def test_discover_git_root_outside_repo(self):
+        with IgnorantTemporaryDirectory() as temp_dir:
+            self.assertIsNone(discover_git_root(os.path.join(temp_dir, "x.py")))
+
+    def test_files_git_root(self):
+        with IgnorantTemporaryDirectory() as temp_dir:
+            temp_dir = Path(temp_dir).resolve()
+            repo_a = temp_dir / "a"
+            repo_b = temp_dir / "b"
+            repo_a.mkdir()
+            repo_b.mkdir()
+            make_repo(repo_a)
+            make_repo(repo_b)
+            outside = temp_dir / "outside.py"
+
+            io = MagicMock()
+            self.assertEqual(
+                files_git_root([repo_a / "x.py", repo_a / "y.py", outside], io), str(repo_a)
+            )
+            self.assertIsNone(files_git_root([outside], io))
+            io.tool_warning.assert_not_called()
+
+            self.assertIsNone(files_git_root([repo_a / "x.py", repo_b / "y.py"], io))
+            io.tool_warning.assert_called_once_with("Files are in different git repos.")
+
+    def test_get_repo_info_caches_until_head_moves(self):
+        with IgnorantTemporaryDirectory() as home_dir:
+            with patch.dict(os.environ, {"HOME": home_dir}):
+                with GitTemporaryDirectory() as temp_dir:
+                    root = str(Path(temp_dir).resolve())
+                    repo = git.Repo(root)
+                    Path("one.py").write_text("one\n")
+                    repo.git.add("one.py")
+                    repo.git.commit("-m", "one")
+
+                    info = get_repo_info(root)
+                    self.assertEqual(info["git_root"], root)
+                    self.assertEqual(info["tracked_files"], ["one.py"])
+
+                    cache_dname = Path(home_dir) / ".aider" / "caches" / "repo_discovery"
+                    self.assertEqual(len(list(cache_dname.iterdir())), 1)
+
+                    # Subdirectories of the same repo share its single cache entry
+                    subdir = Path(root) / "sub"
+                    subdir.mkdir()
+                    with patch("aider.operator.discovery_cache.list_head_files") as mock_list:
+                        info = get_repo_info(root)
+                        self.assertEqual(get_repo_info(subdir)["git_root"], root)
+                        mock_list.assert_not_called()
+                    self.assertEqual(info["tracked_files"], ["one.py"])
+                    self.assertEqual(len(list(cache_dname.iterdir())), 1)
+
+                    Path("two.py").write_text("two\n")
+                    repo.git.add("two.py")
+                    repo.git.commit("-m", "two")
+
+                    info = get_repo_info(root)
+                    self.assertEqual(sorted(info["tracked_files"]), ["one.py", "two.py"])
+                    # The listing for the old HEAD is replaced, not kept alongside
+                    self.assertEqual(len(list(cache_dname.iterdir())), 1)
+
+    def test_get_repo_info_finds_new_nested_repo(self):
+        with IgnorantTemporaryDirectory() as home_dir:
+            with patch.dict(os.environ, {"HOME": home_dir}):
+                with GitTemporaryDirectory() as temp_dir:
+                    outer = str(Path(temp_dir).resolve())
+                    repo = git.Repo(outer)
+                    Path("one.py").write_text("one\n")
+                    repo.git.add("one.py")
+                    repo.git.commit("-m", "one")
+
+                    sub = Path(outer) / "sub"
+                    sub.mkdir()
+                    self.assertEqual(get_repo_info(sub)["git_root"], outer)
+
+                    # A closer repo created later wins, even though outer's HEAD didn't move
+                    make_repo(sub)
+                    self.assertEqual(get_repo_info(sub)["git_root"], str(sub))
@@ -78,3 +78,34 @@ class TestModelInfoManager(TestCase):
 
             # Verify _update_cache was called with verify=False
             mock_get.assert_called_with(self.manager.MODEL_INFO_URL, timeout=5, verify=False)
+
+    def test_stale_cache_is_used_while_refreshing(self):
+        self.manager.cache_file.write_text('{"test_model": {"max_tokens": 4096}}')
+
+        with patch("time.time", return_value=9999999999):
+            with patch.object(self.manager, "_update_cache") as mock_update:
+                result = self.manager.get_model_from_cached_json_db("test_model")
+                self.manager._refresh_thread.join()
+
+                # The stale entry is served, and refreshed in the background
+                self.assertEqual(result, {"max_tokens": 4096})
+                mock_update.assert_called_once()
+
+    @patch("requests.get")
+    def test_disable_remote_models(self, mock_get):
+        os.environ["AIDER_DISABLE_REMOTE_MODELS"] = "1"
+
+        # No cache at all, nothing is fetched
+        self.assertEqual(self.manager.get_model_from_cached_json_db("test_model"), {})
+        mock_get.assert_not_called()
+
+        # A stale cache is used as-is
+        manager = ModelInfoManager()
+        manager.cache_dir = self.manager.cache_dir
+        manager.cache_file = self.manager.cache_file
+        manager.cache_file.write_text('{"test_model": {"max_tokens": 4096}}')
+        with patch("time.time", return_value=9999999999):
+            result = manager.get_model_from_cached_json_db("test_model")
+        self.assertEqual(result, {"max_tokens": 4096})
+        self.assertIsNone(manager._refresh_thread)
+        mock_get.assert_not_called()
@@ -5,6 +5,7 @@ from aider.models import (
     ANTHROPIC_BETA_HEADER,
     Model,
     ModelInfoManager,
+    get_default_repo_map_tokens,
     register_models,
     sanity_check_model,
     sanity_check_models,
@@ -30,6 +31,12 @@ class TestModels(unittest.TestCase):
         info = manager.get_model_info("non-existent-model")
         self.assertEqual(info, {})
 
+    def test_get_default_repo_map_tokens_matches_model(self):
+        for name in ["gpt-3.5-turbo", "gpt-4", "gpt-4o", "sonnet", "non-existent-model"]:
+            self.assertEqual(
+                get_default_repo_map_tokens(name), Model(name).get_repo_map_tokens(), name
+            )
+
     def test_max_context_tokens(self):
         model = Model("gpt-3.5-turbo")
         self.assertEqual(model.info["max_input_tokens"], 16385)
@@ -0,0 +1,111 @@
+from unittest import TestCase
+from unittest.mock import MagicMock, patch
+
+from aider.operator.core import OperatorIO, run_aider_operator
+
+
+def make_model(name, **kwargs):
+    model = MagicMock()
+    model.name = name
+    return model
+
+
+class TestRunAiderOperator(TestCase):
+    def setUp(self):
+        self.creates = []
+        self.coders = []
+
+        def create(**kwargs):
+            repo = kwargs.get("repo")
+            # Snapshot the commit models at the moment each coder is created
+            self.creates.append((kwargs, list(repo.models) if repo else None))
+            coder = MagicMock()
+            coder.get_inchat_relative_files.return_value = ["found.py"]
+            self.coders.append(coder)
+            return coder
+
+        coder_patcher = patch("aider.operator.core.Coder")
+        self.mock_coder = coder_patcher.start()
+        self.mock_coder.create.side_effect = create
+        self.addCleanup(coder_patcher.stop)
+
+        model_patcher = patch("aider.operator.core.Model", side_effect=make_model)
+        self.mock_model = model_patcher.start()
+        self.addCleanup(model_patcher.stop)
+
+    def run_operator(self, initial_files, repo=None, map_tokens=2048):
+        return run_aider_operator(
+            user_prompt="do the thing",
+            initial_files=initial_files,
+            read_only_files=["/proj/NOTES.md"],
+            lcr_model_name="lcr-model",
+            architect_model_name="architect-model",
+            editor_model_name="editor-model",
+            weak_model_name=None,
+            operator_io=OperatorIO(),
+            repo=repo,
+            coder_root="/proj",
+            use_git=repo is not None,
+            auto_commits=True,
+            dirty_commits=True,
+            verbose=False,
+            map_tokens=map_tokens,
+            map_refresh="auto",
+            map_mul_no_files=8,
+        )
+
+    def model_names(self):
+        return [call.args[0] for call in self.mock_model.call_args_list]
+
+    def test_explicit_files_skip_lcr(self):
+        self.assertEqual(self.run_operator(["/proj/a.py"]), 0)
+
+        self.assertEqual(len(self.creates), 1)
+        kwargs, _ = self.creates[0]
+        self.assertEqual(kwargs["edit_format"], "architect")
+        self.assertEqual(kwargs["fnames"], ["/proj/a.py"])
+        self.assertEqual(kwargs["read_only_fnames"], ["/proj/NOTES.md"])
+        self.assertNotIn("from_coder", kwargs)
+
+        # The LCR model is never initialized
+        self.assertEqual(self.model_names(), ["architect-model"])
+
+    def test_no_files_runs_lcr_then_architect(self):
+        self.assertEqual(self.run_operator([]), 0)
+
+        self.assertEqual(len(self.creates), 2)
+        lcr_kwargs, _ = self.creates[0]
+        architect_kwargs, _ = self.creates[1]
+        self.assertEqual(lcr_kwargs["edit_format"], "large_context_retriever")
+        self.assertEqual(architect_kwargs["edit_format"], "architect")
+
+        lcr_coder = self.coders[0]
+        lcr_coder.run.assert_called_once_with(with_message="do the thing")
+        self.assertIs(architect_kwargs["from_coder"], lcr_coder)
+        self.assertNotIn("fnames", architect_kwargs)
+
+        self.assertEqual(sorted(self.model_names()), ["architect-model", "lcr-model"])
+
+    def test_commit_models_set_before_phase_2(self):
+        repo = MagicMock()
+        repo.models = []
+
+        self.assertEqual(self.run_operator([], repo=repo), 0)
+
+        architect_model = repo.models[1]
+        self.assertEqual(architect_model.name, "architect-model")
+
+        _, lcr_commit_models = self.creates[0]
+        _, architect_commit_models = self.creates[1]
+        self.assertEqual(lcr_commit_models, [])
+        self.assertEqual(architect_commit_models, [architect_model.weak_model, architect_model])
+
+    def test_default_map_tokens_come_from_architect_model(self):
+        with patch(
+            "aider.operator.core.get_default_repo_map_tokens", return_value=3072
+        ) as mock_default:
+            self.assertEqual(self.run_operator([], map_tokens=None), 0)
+
+        mock_default.assert_called_once_with("architect-model")
+        for kwargs, _ in self.creates:
+            self.assertEqual(kwargs["map_tokens"], 3072)
@@ -0,0 +1,104 @@
+import json
+import os
+from dataclasses import replace
+from pathlib import Path
+from unittest import TestCase
+from unittest.mock import patch
+
+from aider import models
+from aider.operator.registry_cache import register_model_files
+from aider.utils import IgnorantTemporaryDirectory
+
+
+class TestRegistryCache(TestCase):
+    def setUp(self):
+        self._original_settings = list(models.MODEL_SETTINGS)
+        self._original_metadata = dict(models.model_info_manager.local_model_metadata)
+
+        self.homedir_obj = IgnorantTemporaryDirectory()
+        self.env_patcher = patch.dict(os.environ, {"HOME": self.homedir_obj.name})
+        self.env_patcher.start()
+
+        self.tempdir_obj = IgnorantTemporaryDirectory()
+        tempdir = Path(self.tempdir_obj.name)
+        self.settings_file = tempdir / ".aider.model.settings.yml"
+        self.settings_file.write_text("- name: test/cached-model\n  edit_format: diff\n")
+        self.metadata_file = tempdir / ".aider.model.metadata.json"
+        self.metadata_file.write_text(json.dumps({"test/cached-model": {"max_input_tokens": 1234}}))
+
+    def tearDown(self):
+        models.MODEL_SETTINGS[:] = self._original_settings
+        models.model_info_manager.local_model_metadata.clear()
+        models.model_info_manager.local_model_metadata.update(self._original_metadata)
+        self.env_patcher.stop()
+        self.homedir_obj.cleanup()
+        self.tempdir_obj.cleanup()
+
+    def reset_registry(self):
+        models.MODEL_SETTINGS[:] = self._original_settings
+        models.model_info_manager.local_model_metadata.clear()
+        models.model_info_manager.local_model_metadata.update(self._original_metadata)
+
+    def assert_registered(self, max_input_tokens):
+        settings = [ms for ms in models.MODEL_SETTINGS if ms.name == "test/cached-model"]
+        self.assertEqual(len(settings), 1)
+        self.assertEqual(settings[0].edit_format, "diff")
+        self.assertEqual(
+            models.model_info_manager.local_model_metadata["test/cached-model"],
+            {"max_input_tokens": max_input_tokens},
+        )
+
+    def test_registrations_are_replayed_from_cache(self):
+        loaded = register_model_files([self.settings_file], [self.metadata_file])
+        self.assertEqual(
+            [list(map(str, files)) for files in loaded],
+            [[str(self.settings_file)], [str(self.metadata_file)]],
+        )
+        self.assert_registered(1234)
+
+        self.reset_registry()
+        with patch("aider.models.register_models") as mock_settings:
+            with patch("aider.models.register_litellm_models") as mock_metadata:
+                loaded = register_model_files([self.settings_file], [self.metadata_file])
+                mock_settings.assert_not_called()
+                mock_metadata.assert_not_called()
+        self.assertEqual(loaded, ([str(self.settings_file)], [str(self.metadata_file)]))
+        self.assert_registered(1234)
+
+    def test_changed_file_is_parsed_again(self):
+        register_model_files([self.settings_file], [self.metadata_file])
+
+        self.reset_registry()
+        self.metadata_file.write_text(
+            json.dumps({"test/cached-model": {"max_input_tokens": 5678, "extra": 1}})
+        )
+        register_model_files([self.settings_file], [self.metadata_file])
+        self.assertEqual(
+            models.model_info_manager.local_model_metadata["test/cached-model"],
+            {"max_input_tokens": 5678, "extra": 1},
+        )
+
+    def test_overrides_of_existing_models_are_all_replayed(self):
+        # Fresh copies that nothing else references, so overridden objects really get freed
+        models.MODEL_SETTINGS[:] = [replace(ms) for ms in self._original_settings]
+        names = [ms.name for ms in models.MODEL_SETTINGS if ms.name != "aider/extra_params"]
+        names = list(dict.fromkeys(names))[:5]
+        self.settings_file.write_text(
+            "".join(f"- name: {name}\n  edit_format: test-format\n" for name in names)
+        )
+
+        register_model_files([self.settings_file], [])
+
+        def check_overrides():
+            for name in names:
+                settings = [ms for ms in models.MODEL_SETTINGS if ms.name == name]
+                self.assertEqual(len(settings), 1, name)
+                self.assertEqual(settings[0].edit_format, "test-format", name)
+
+        check_overrides()
+
+        models.MODEL_SETTINGS[:] = [replace(ms) for ms in self._original_settings]
+        with patch("aider.models.register_models") as mock_settings:
+            register_model_files([self.settings_file], [])
+            mock_settings.assert_not_called()
+        check_overrides()
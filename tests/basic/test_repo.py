@@ -247,6 +247,26 @@ class TestRepo(unittest.TestCase):
         # Assert that coder.get_tracked_files() returns the three filenames
         self.assertEqual(set(tracked_files), set(created_files))
 
+    def test_get_tracked_files_seeded_with_tracked_files(self):
+        with GitTemporaryDirectory():
+            raw_repo = git.Repo()
+            Path("committed.py").touch()
+            raw_repo.git.add("committed.py")
+            raw_repo.git.commit("-m", "added")
+
+            Path("staged.py").touch()
+            raw_repo.git.add("staged.py")
+
+            # A known listing of the HEAD commit is used instead of walking the tree
+            git_repo = GitRepo(InputOutput(), None, None, tracked_files=["listed.py"])
+            with patch.object(git.objects.Tree, "traverse") as mock_traverse:
+                tracked_files = git_repo.get_tracked_files()
+                mock_traverse.assert_not_called()
+
+            self.assertEqual(git_repo.tree_files[raw_repo.head.commit], {"listed.py"})
+            # Index entries (committed and staged) are still added on top of the listing
+            self.assertEqual(set(tracked_files), {"listed.py", "committed.py", "staged.py"})
+
     def test_get_tracked_files_with_new_staged_file(self):
         with GitTemporaryDirectory():
             # new repo